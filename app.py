@@ -4,10 +4,15 @@
 # -----------------------------
 # Features:
 # ▪ Punch-in / punch-out with selfie upload to Google Drive
+# ▪ Content-hash upload cache (identical selfies/documents are uploaded once)
 # ▪ Weekly roaster submission
 # ▪ Duplicate-punch safeguard (same manager + kitchen + action + date)
 # ▪ Dashboards: Roaster View, Attendance, Visit Summary
+# ▪ Shared caches warmed at startup and before shift peaks (WARMUP_TIMES, IST)
+# ▪ Live board mode for Attendance / Visit Summary (incremental auto-refresh via st.fragment)
+# ▪ Bulk report export (tab + `python report_export.py`) as CSV/XLSX/Parquet
 # ▪ Accurate client-side latitude/longitude using streamlit_js_eval
+# ▪ Opt-in per-rerun profiling (?profile=1) with section timings + collapsed-stack dumps
 # ▪ Polished orange theme + white select boxes (selected value always visible)
 #
 # Prerequisites (install before running):
@@ -31,18 +36,162 @@ except ModuleNotFoundError:
 
 import gspread
 import datetime
+import hashlib
 import json
 import requests
 import pandas as pd
 import pytz
 import time
+import os
+import sys
+import threading
+import collections
+import io
+import logging
+import tempfile
+import zipfile
 from google.oauth2.service_account import Credentials
 from google.auth.transport.requests import AuthorizedSession
 from google.auth.exceptions import RefreshError
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+import report_export
 
 # -------------------- CONFIG --------------------
 st.set_page_config(page_title="HYBB Attendance System", layout="wide")
 
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+logger = logging.getLogger("hybb_attendance")
+
+# -------------------- PROFILING (opt-in: ?profile=1 or PROFILE_RERUNS secret) --------------------
+PROFILE_DIR = st.secrets.get("PROFILE_DIR", "profiles")
+PROFILE_INTERVAL_MS = float(st.secrets.get("PROFILE_INTERVAL_MS", 5))
+PROFILE_KEEP = int(st.secrets.get("PROFILE_KEEP", 50))  # newest reruns kept in PROFILE_DIR
+
+class RerunProfiler:
+    """
+    Sampling profiler for one script rerun. A daemon thread samples the script
+    thread's stack every few ms and tags each sample with the current section
+    (setup, geolocation, punch, tab:...). Writes a collapsed-stack (.folded, for
+    flamegraph.pl / speedscope) and a JSON summary per rerun into PROFILE_DIR.
+    If the rerun ends without reaching finish() (st.stop()), the sampler notices
+    the script is gone, records the end time and writes a "stopped" profile itself.
+    """
+    def __init__(self, interval_ms=PROFILE_INTERVAL_MS):
+        self.interval = interval_ms / 1000.0
+        self.thread_id = threading.get_ident()
+        self.script_file = os.path.abspath(__file__)
+        # This rerun's module frame: a later rerun on the same thread gets a new one
+        self.module_frame = sys._getframe()
+        while self.module_frame is not None and not (
+                self.module_frame.f_code.co_name == "<module>"
+                and os.path.abspath(self.module_frame.f_code.co_filename) == self.script_file):
+            self.module_frame = self.module_frame.f_back
+        self.started_at = datetime.datetime.now()
+        self.started = time.perf_counter()
+        self.ended = None
+        self.section = "render"
+        self.section_started = self.started
+        self.section_times = collections.OrderedDict()
+        self.stacks = collections.Counter()
+        self.summary = None
+        self.finish_lock = threading.Lock()
+        self.running = True
+        self.sampler = threading.Thread(target=self._sample_loop, daemon=True)
+        self.sampler.start()
+
+    def _script_stack(self):
+        """
+        Current stack of this rerun on the script thread, or None once the rerun is over
+        (its own module frame is gone, even if a new rerun has re-entered the script).
+        """
+        frame = sys._current_frames().get(self.thread_id)
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+            if frame is self.module_frame:
+                # Streamlit's script-runner frames above the module frame are dropped
+                return stack[::-1]
+            frame = frame.f_back
+        return None
+
+    def _sample_loop(self):
+        while self.running:
+            stack = self._script_stack()
+            if stack is None:
+                # Thread exited or left the script (st.stop()) without calling finish()
+                self.ended = time.perf_counter()
+                self.finish(status="stopped")
+                return
+            self.stacks[";".join([self.section] + stack)] += 1
+            time.sleep(self.interval)
+
+    def mark(self, section, now=None):
+        """Close the current section and start timing `section`."""
+        now = now or time.perf_counter()
+        self.section_times[self.section] = self.section_times.get(self.section, 0.0) + now - self.section_started
+        self.section, self.section_started = section, now
+
+    def finish(self, status="complete"):
+        """Stop sampling, write the per-rerun files and return a summary dict (once)."""
+        with self.finish_lock:
+            if self.summary is not None:
+                return self.summary
+            end = self.ended or time.perf_counter()
+            self.mark(self.section, now=end)
+            self.running = False
+            if threading.current_thread() is not self.sampler:
+                self.sampler.join(timeout=1)
+            self.module_frame = None
+
+            self_samples = collections.Counter()
+            for stack, count in self.stacks.items():
+                self_samples[stack.rsplit(";", 1)[-1]] += count
+            summary = {
+                "started_at": self.started_at.isoformat(timespec="seconds"),
+                "status": status,
+                "total_seconds": round(end - self.started, 4),
+                "interval_ms": self.interval * 1000,
+                "sections": {k: round(v, 4) for k, v in self.section_times.items()},
+                "hot_spots": self_samples.most_common(15),
+            }
+
+            try:
+                os.makedirs(PROFILE_DIR, exist_ok=True)
+                base = os.path.join(PROFILE_DIR, f"rerun_{self.started_at.strftime('%Y%m%d_%H%M%S_%f')}_{status}")
+                with open(base + ".folded", "w") as f:
+                    for stack, count in self.stacks.items():
+                        f.write(f"{stack} {count}\n")
+                with open(base + ".json", "w") as f:
+                    json.dump(summary, f, indent=2)
+                summary["files"] = [base + ".folded", base + ".json"]
+                prune_profiles()
+            except OSError as e:
+                summary["files"] = []
+                summary["write_error"] = str(e)
+            self.summary = summary
+            return summary
+
+def prune_profiles(keep=PROFILE_KEEP):
+    """Keep only the newest `keep` reruns (.folded + .json pairs) in PROFILE_DIR."""
+    runs = sorted({os.path.splitext(name)[0] for name in os.listdir(PROFILE_DIR) if name.startswith("rerun_")})
+    for run in runs[:max(len(runs) - keep, 0)]:
+        for ext in (".folded", ".json"):
+            try:
+                os.remove(os.path.join(PROFILE_DIR, run + ext))
+            except FileNotFoundError:
+                pass
+
+def profiling_requested():
+    return str(st.query_params.get("profile", "")).lower() in ("1", "true", "yes") or bool(st.secrets.get("PROFILE_RERUNS", False))
+
+profiler = RerunProfiler() if profiling_requested() else None
+
+def profile_mark(section):
+    if profiler:
+        profiler.mark(section)
+
 # -------------------- STYLING --------------------
 st.markdown(
     """
@@ -105,6 +254,7 @@ st.markdown('<div class="title" style="font-size:2.2rem;font-weight:700;margin-b
 st.markdown('<div class="company" style="font-size:1.3rem;font-weight:600;margin-bottom:1.5em;">Hygiene Bigbite Pvt Ltd</div>', unsafe_allow_html=True)
 
 # -------------------- GEOLOCATION (client-side) --------------------
+profile_mark("geolocation")
 # Uses streamlit_js_eval to run JS -> navigator.geolocation
 if "user_lat" not in st.session_state:
     st.session_state["user_lat"] = None
@@ -121,6 +271,7 @@ if get_geolocation and (st.session_state["user_lat"] is None or st.session_state
 
 
 # -------------------- GOOGLE AUTH (google-auth + AuthorizedSession) --------------------
+profile_mark("setup")
 SCOPES = [
     "https://www.googleapis.com/auth/spreadsheets",
     "https://www.googleapis.com/auth/drive"
@@ -132,19 +283,33 @@ def get_google_creds():
     creds = Credentials.from_service_account_info(key_dict, scopes=SCOPES)
     return creds
 
+@st.cache_resource(show_spinner=False)
+def get_google_clients():
+    """Creds, gspread client and AuthorizedSession — built once per process, shared by all sessions."""
+    creds = get_google_creds()
+    return creds, gspread.authorize(creds), AuthorizedSession(creds)
+
 # Create creds, gspread client and authorized session (with retries on refresh errors)
 try:
-    creds = get_google_creds()
-    client = gspread.authorize(creds)
-    authed_session = AuthorizedSession(creds)
+    creds, client, authed_session = get_google_clients()
 except Exception as e:
     st.error("❌ Google auth failed. Please check GOOGLE_SHEETS_CREDS in Streamlit secrets.")
     st.exception(e)
     st.stop()
 
 # -------------------- RETRY HELPERS --------------------
-def retry(func, *args, retries=3, delay=2, backoff=1.5, **kwargs):
+def default_notify(level, message):
+    """Show retry messages in the page; off the script thread (warm-up) there is no page, so log them."""
+    if get_script_run_ctx() is None:
+        logger.log(logging.ERROR if level == "error" else logging.WARNING, message)
+    elif level == "error":
+        st.error(message)
+    else:
+        st.warning(message)
+
+def retry(func, *args, retries=3, delay=2, backoff=1.5, notify=None, **kwargs):
     """Generic retry wrapper for API calls."""
+    notify = notify or default_notify
     attempt = 0
     while attempt < retries:
         try:
@@ -152,31 +317,35 @@ def retry(func, *args, retries=3, delay=2, backoff=1.5, **kwargs):
         except RefreshError as re:
             # Credentials refresh problems — try to re-create creds once
             attempt += 1
-            st.warning(f"Auth refresh error (attempt {attempt}/{retries}): {re}")
+            notify("warning", f"Auth refresh error (attempt {attempt}/{retries}): {re}")
             try:
-                # try to refresh credentials object
-                new_creds = get_google_creds()
-                # re-authorize client and session
+                # drop the shared clients/sheet handles and re-authorize
                 global client, authed_session, creds
-                creds = new_creds
-                client = gspread.authorize(creds)
-                authed_session = AuthorizedSession(creds)
+                get_google_clients.clear()
+                open_spreadsheet.clear()
+                resolve_worksheets.clear()
+                creds, client, authed_session = get_google_clients()
             except Exception as e2:
-                st.warning(f"Re-create creds failed: {e2}")
+                notify("warning", f"Re-create creds failed: {e2}")
             time.sleep(delay * (backoff ** attempt))
         except Exception as e:
             attempt += 1
             if attempt < retries:
-                st.warning(f"API call failed (attempt {attempt}/{retries}): {e}. Retrying in {delay} seconds...")
+                notify("warning", f"API call failed (attempt {attempt}/{retries}): {e}. Retrying in {delay} seconds...")
                 time.sleep(delay * (backoff ** attempt))
             else:
-                st.error(f"API call failed after {retries} attempts: {e}")
+                notify("error", f"API call failed after {retries} attempts: {e}")
                 raise
 
 # -------------------- SHEET UTILITIES (safe wrappers) --------------------
-def safe_open(spreadsheet_name):
+@st.cache_resource(show_spinner=False)
+def open_spreadsheet(spreadsheet_name):
+    """Spreadsheet handle (metadata fetch) shared across reruns and sessions."""
     return retry(client.open, spreadsheet_name)
 
+def safe_open(spreadsheet_name):
+    return open_spreadsheet(spreadsheet_name)
+
 def safe_worksheet(spreadsheet_name, worksheet_name, rows=1000, cols=20):
     """Open or create worksheet safely."""
     sh = safe_open(spreadsheet_name)
@@ -193,35 +362,248 @@ def safe_get_all_records(ws):
 def safe_append_row(ws, row):
     return retry(ws.append_row, row)
 
+# -------------------- SHARED SHEET CACHES --------------------
+ROASTER_CACHE_TTL = int(st.secrets.get("ROASTER_CACHE_TTL", 300))
+ATTENDANCE_CACHE_TTL = int(st.secrets.get("ATTENDANCE_CACHE_TTL", 120))
+TODAY_READ_MARGIN = 50  # extra rows read above today's first cached row (covers deletions)
+
+@st.cache_resource(show_spinner=False)
+def get_punch_lock():
+    """Process-wide lock for duplicate check + append (the script body reruns, so no module-level lock)."""
+    return threading.Lock()
+
+@st.cache_resource(show_spinner=False)
+def resolve_worksheets():
+    """Attendance (sheet1) and Roaster worksheets, creating Roaster with its header if missing."""
+    sh = safe_open("Manager Visit Tracker")
+    attendance_ws = sh.sheet1
+    try:
+        roaster_ws = retry(sh.worksheet, "Roaster")
+    except gspread.exceptions.WorksheetNotFound:
+        roaster_ws = retry(sh.add_worksheet, "Roaster", rows=1000, cols=5)
+        # safe_insert header
+        try:
+            retry(roaster_ws.insert_row, ["Date", "Manager", "Kitchen", "Login Time", "Remarks"], 1)
+        except Exception:
+            pass
+    return attendance_ws, roaster_ws
+
+@st.cache_resource(show_spinner=False)
+def get_shared_snapshots():
+    """
+    Process-wide holder for the roster and attendance snapshots. Entries are replaced
+    with a freshly built snapshot, never cleared first, so readers always have one.
+    """
+    return {"entries": {}, "locks": {"roaster": threading.Lock(), "attendance": threading.Lock()}}
+
+def shared_snapshot(name, build, ttl):
+    """
+    Return snapshot `name`, rebuilding it once older than `ttl` seconds. While one
+    thread rebuilds, everyone else keeps getting the previous snapshot.
+    """
+    holder = get_shared_snapshots()
+    entry = holder["entries"].get(name)
+    if entry is not None and time.monotonic() - entry["at"] < ttl:
+        return entry["value"]
+    lock = holder["locks"][name]
+    if not lock.acquire(blocking=entry is None):
+        return entry["value"]
+    try:
+        entry = holder["entries"].get(name)
+        if entry is not None and time.monotonic() - entry["at"] < ttl:
+            return entry["value"]
+        return refresh_snapshot(name, build, locked=True)
+    finally:
+        lock.release()
+
+def refresh_snapshot(name, build, locked=False):
+    """Build a new snapshot and swap it in; the old one stays readable until then."""
+    holder = get_shared_snapshots()
+    if not locked:
+        with holder["locks"][name]:
+            return refresh_snapshot(name, build, locked=True)
+    value = build()
+    holder["entries"][name] = {"value": value, "at": time.monotonic()}
+    return value
+
+def invalidate_snapshot(name):
+    """Mark a snapshot stale (next reader rebuilds it) without dropping it."""
+    entry = get_shared_snapshots()["entries"].get(name)
+    if entry is not None:
+        entry["at"] = float("-inf")
+
+def build_roaster_df():
+    roaster_records = safe_get_all_records(resolve_worksheets()[1])
+    df = pd.DataFrame(roaster_records)
+    if not df.empty and "Date" in df.columns:
+        df["Date"] = pd.to_datetime(df["Date"], errors="coerce").dt.date
+    return df
+
+def load_roaster_df():
+    # copy: callers (Roaster View) modify the frame in place
+    return shared_snapshot("roaster", build_roaster_df, ROASTER_CACHE_TTL).copy()
+
+def punch_key(date, manager, kitchen, action):
+    return (str(date), manager, kitchen, action)
+
+def build_attendance_index():
+    """
+    Attendance rows plus by_date = {"YYYY-MM-DD": [row positions]}, used to locate
+    today's rows for fresh_punch_keys(). Treat as read-only outside record_punch().
+    """
+    attendance_ws = resolve_worksheets()[0]
+    header = retry(attendance_ws.row_values, 1)
+    records = safe_get_all_records(attendance_ws)
+    index = {"header": header, "records": records, "by_date": {}}
+    for i, r in enumerate(records):
+        index["by_date"].setdefault(str(r.get("Date")), []).append(i)
+    return index
+
+def load_attendance_index():
+    return shared_snapshot("attendance", build_attendance_index, ATTENDANCE_CACHE_TTL)
+
+def fresh_punch_keys(day_str, index=None):
+    """
+    Punch keys for `day_str` read live from the sheet. Only the tail from that day's
+    first cached row (minus a margin) is fetched, so rows added by other replicas,
+    edited or deleted by hand since the cached snapshot are all seen.
+    """
+    index = index or load_attendance_index()
+    header = index["header"]
+    if not header:
+        return set()
+    positions = index["by_date"].get(day_str)
+    first = positions[0] if positions else len(index["records"])
+    start_row = max(first - TODAY_READ_MARGIN, 0) + 2  # +1 header, +1 for 1-based rows
+    end_col = gspread.utils.rowcol_to_a1(1, len(header)).rstrip("0123456789")
+    keys = set()
+    for values in retry(worksheet.get, f"A{start_row}:{end_col}"):
+        r = dict(zip(header, values))
+        if str(r.get("Date")) == day_str:
+            keys.add(punch_key(r.get("Date"), r.get("Manager Name"), r.get("Kitchen Name"), r.get("Action")))
+    return keys
+
+def record_punch(row):
+    """
+    Re-check for a duplicate (ranged read of today's rows) and append the punch row
+    under the process-wide punch lock, then keep the shared attendance index in step.
+    The snapshot is loaded before taking the lock, so a cold load never blocks other
+    punches. Returns False on a duplicate.
+    """
+    key = punch_key(row[0], row[2], row[3], row[4])
+    try:
+        index = load_attendance_index()
+    except Exception as e:
+        index = None
+        st.warning(f"⚠️ Unable to re-check attendance sheet for duplicates: {e}")
+    with get_punch_lock():
+        if index is not None:
+            try:
+                if key in fresh_punch_keys(str(row[0]), index):
+                    return False
+            except Exception as e:
+                st.warning(f"⚠️ Unable to re-check attendance sheet for duplicates: {e}")
+        safe_append_row(worksheet, row)
+        if index is not None:
+            header = index["header"] if len(index["header"]) >= len(row) else [
+                "Date", "Time", "Manager Name", "Kitchen Name", "Action", "Latitude", "Longitude", "Selfie", "Location"]
+            index["records"].append(dict(zip(header, row)))
+            index["by_date"].setdefault(str(row[0]), []).append(len(index["records"]) - 1)
+    return True
+
 # -------------------- INITIAL SHEET OBJECTS --------------------
 try:
-    worksheet = safe_open("Manager Visit Tracker").sheet1
+    worksheet, roaster_sheet = resolve_worksheets()
 except Exception as e:
     st.error("❌ Unable to open 'Manager Visit Tracker' spreadsheet.")
     st.exception(e)
     st.stop()
 
-# -------------------- ROASTER SHEET --------------------
-try:
-    roaster_sheet = safe_open("Manager Visit Tracker").worksheet("Roaster")
-except gspread.exceptions.WorksheetNotFound:
-    roaster_sheet = safe_open("Manager Visit Tracker").add_worksheet("Roaster", rows=1000, cols=5)
-    # safe_insert header
-    try:
-        retry(roaster_sheet.insert_row, ["Date", "Manager", "Kitchen", "Login Time", "Remarks"], 1)
-    except Exception:
-        pass
-
-# Load into DataFrame safely
+# Load roaster into DataFrame safely (served from the shared cache when warm)
 try:
-    roaster_records = safe_get_all_records(roaster_sheet)
-    roaster_df = pd.DataFrame(roaster_records)
-    if not roaster_df.empty and "Date" in roaster_df.columns:
-        roaster_df["Date"] = pd.to_datetime(roaster_df["Date"], errors="coerce").dt.date
+    roaster_df = load_roaster_df()
 except Exception:
     roaster_df = pd.DataFrame()
     st.warning("⚠️ Could not load roaster data.")
 
+# -------------------- CACHE WARM-UP (startup + before shift peaks) --------------------
+WARMUP_WINDOW_MINUTES = int(st.secrets.get("WARMUP_WINDOW_MINUTES", 90))  # keep caches fresh this long after each slot
+
+def parse_warmup_times(value):
+    """WARMUP_TIMES secret: "08:45", "08:45,17:45" or ["08:45", "17:45"] (IST) -> [(hour, minute)]."""
+    entries = value.split(",") if isinstance(value, str) else list(value)
+    times = []
+    for entry in entries:
+        try:
+            at = datetime.datetime.strptime(str(entry).strip(), "%H:%M")
+            times.append((at.hour, at.minute))
+        except ValueError:
+            st.warning(f"⚠️ Ignoring invalid WARMUP_TIMES entry {entry!r} (expected HH:MM)")
+    return times
+
+WARMUP_TIMES = parse_warmup_times(st.secrets.get("WARMUP_TIMES", "08:45"))
+
+def warm_caches(refresh=False):
+    """
+    Pre-authenticate, resolve worksheets and preload roster + attendance indexes.
+    With refresh=True new snapshots are built first and then swapped in, so punches
+    during the refresh keep reading the previous (warm) ones.
+    """
+    started = time.perf_counter()
+    try:
+        get_google_clients()
+        resolve_worksheets()
+        if refresh:
+            refresh_snapshot("roaster", build_roaster_df)
+            refresh_snapshot("attendance", build_attendance_index)
+        else:
+            load_roaster_df()
+            load_attendance_index()
+        logger.info("Cache warm-up done in %.1fs", time.perf_counter() - started)
+    except Exception:
+        logger.exception("Cache warm-up failed")
+
+def seconds_until_next_warmup():
+    ist = pytz.timezone("Asia/Kolkata")
+    now = datetime.datetime.now(ist)
+    upcoming = []
+    for hour, minute in WARMUP_TIMES:
+        at = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if at <= now:
+            at += datetime.timedelta(days=1)
+        upcoming.append(at)
+    return (min(upcoming) - now).total_seconds() if upcoming else None
+
+def warmup_loop():
+    """
+    Warm once, then at each WARMUP_TIMES slot refresh and keep refreshing within the
+    TTLs for WARMUP_WINDOW_MINUTES, so the shift peak never finds an expired cache.
+    """
+    warm_caches()
+    refresh_every = max(min(ROASTER_CACHE_TTL, ATTENDANCE_CACHE_TTL) // 2, 10)
+    while True:
+        try:
+            wait = seconds_until_next_warmup()
+            if wait is None:
+                return
+            time.sleep(wait)
+            window_end = time.monotonic() + WARMUP_WINDOW_MINUTES * 60
+            while time.monotonic() < window_end:
+                warm_caches(refresh=True)
+                time.sleep(refresh_every)
+        except Exception:
+            logger.exception("Cache warm-up scheduler error")
+            time.sleep(60)
+
+@st.cache_resource(show_spinner=False)
+def start_cache_warmup():
+    """Runs once per process: warm now, then again at each WARMUP_TIMES slot."""
+    t = threading.Thread(target=warmup_loop, name="cache-warmup", daemon=True)
+    t.start()
+    return t
+
+start_cache_warmup()
+
 # -------------------- CONSTANTS --------------------
 DRIVE_FOLDER_ID = "1i5SnIkpMPqtU1kSVVdYY4jQK1lwHbR9G"  # Shared-drive folder for selfies
 manager_list = [
@@ -254,17 +636,86 @@ kitchens = [
 ]
 
 # -------------------- DRIVE UPLOAD (safe, with retries) --------------------
+DRIVE_LOOKUP_TIMEOUT = 5  # seconds — dedup lookups must not hold up the punch path
+
+def drive_view_url(file_id):
+    return f"https://drive.google.com/file/d/{file_id}/view?usp=sharing"
+
+def drive_file_alive(file_id):
+    """True if the file still exists and is not trashed (cheap metadata-only GET)."""
+    try:
+        resp = authed_session.get(
+            f"https://www.googleapis.com/drive/v3/files/{file_id}",
+            params={"fields": "id,trashed", "supportsAllDrives": "true"},
+            timeout=DRIVE_LOOKUP_TIMEOUT,
+        )
+        resp.raise_for_status()
+        return not resp.json().get("trashed", False)
+    except Exception:
+        return False
+
+@st.cache_resource(show_spinner=False)
+def get_upload_hash_index():
+    """Process-wide sha256 -> Drive file_id index (survives reruns, shared by all sessions)."""
+    return {}
+
+def find_drive_file_by_hash(digest, folder_id=None):
+    """
+    Look up an already-uploaded file by its content hash (stored in Drive appProperties).
+    Returns the file_id or None if nothing matches / the lookup fails.
+    """
+    query = f"appProperties has {{ key='sha256' and value='{digest}' }} and trashed = false"
+    if folder_id:
+        query += f" and '{folder_id}' in parents"
+    params = {
+        "q": query,
+        "fields": "files(id)",
+        "pageSize": 1,
+        "supportsAllDrives": "true",
+        "includeItemsFromAllDrives": "true",
+    }
+    try:
+        resp = authed_session.get("https://www.googleapis.com/drive/v3/files", params=params, timeout=DRIVE_LOOKUP_TIMEOUT)
+        resp.raise_for_status()
+        files = resp.json().get("files", [])
+        return files[0]["id"] if files else None
+    except Exception:
+        # Lookup is only an optimisation — fall back to a normal upload
+        return None
+
 def upload_file_to_drive_bytes(file_bytes, filename, folder_id=None, mime_type=None, retries=3):
     """
     Uploads bytes to Google Drive using AuthorizedSession and multipart upload.
+    Identical content (same sha256, same folder) is uploaded only once: the existing
+    file's link is returned instead, so retries and double-taps don't duplicate files.
     Returns drive file view URL on success or None on failure.
     """
+    digest = hashlib.sha256(file_bytes).hexdigest()
+    hash_index = get_upload_hash_index()
+    index_key = (folder_id, digest)
+    cached_id = hash_index.get(index_key)
+    if cached_id:
+        if drive_file_alive(cached_id):
+            return drive_view_url(cached_id)
+        # Trashed/deleted (or unverifiable) — forget it and look again / re-upload
+        hash_index.pop(index_key, None)
+    existing_id = find_drive_file_by_hash(digest, folder_id)
+    if existing_id:
+        hash_index[index_key] = existing_id
+        return drive_view_url(existing_id)
+
     url = "https://www.googleapis.com/upload/drive/v3/files?uploadType=multipart&supportsAllDrives=true"
-    metadata = {"name": filename}
+    metadata = {"name": filename, "appProperties": {"sha256": digest}}
     if folder_id:
         metadata["parents"] = [folder_id]
 
     for attempt in range(retries):
+        if attempt > 0:
+            # A failed attempt may still have created the file (timeout / 5xx after commit)
+            existing_id = find_drive_file_by_hash(digest, folder_id)
+            if existing_id:
+                hash_index[index_key] = existing_id
+                return drive_view_url(existing_id)
         try:
             # files param: two parts - metadata (as tuple), file (as tuple)
             files = {
@@ -275,8 +726,9 @@ def upload_file_to_drive_bytes(file_bytes, filename, folder_id=None, mime_type=N
             resp.raise_for_status()
             file_id = resp.json().get("id")
             if file_id:
+                hash_index[index_key] = file_id
                 # Return view link similar to original format
-                return f"https://drive.google.com/file/d/{file_id}/view?usp=sharing"
+                return drive_view_url(file_id)
             return None
         except Exception as e:
             if attempt < retries - 1:
@@ -286,6 +738,185 @@ def upload_file_to_drive_bytes(file_bytes, filename, folder_id=None, mime_type=N
                 st.error(f"Drive upload failed after {retries} attempts: {e}")
                 return None
 
+# -------------------- DASHBOARD RENDERERS --------------------
+def render_attendance(full_df, roaster_df, key_prefix=""):
+    """Date picker + attendance table with roaster mismatch flag."""
+    if full_df.empty:
+        st.info("No attendance data.")
+        return
+    sel_date = st.date_input("Date", value=datetime.date.today(), key=f"{key_prefix}att_date")
+    view_df = full_df[full_df["Date"] == sel_date]
+    if view_df.empty:
+        st.info("No attendance records for this date.")
+        return
+    if not roaster_df.empty:
+        roster_today = roaster_df[roaster_df["Date"] == sel_date][["Manager", "Kitchen"]]
+        view_df["key"] = view_df["Manager Name"] + "|" + view_df["Kitchen Name"]
+        roster_today["key"] = roster_today["Manager"] + "|" + roster_today["Kitchen"]
+        view_df["Mismatch"] = ~view_df["key"].isin(roster_today["key"])
+        view_df = view_df.drop(columns=["key"])
+    st.dataframe(view_df, use_container_width=True)
+
+def render_visit_summary(visit_df, roaster_df, key_prefix=""):
+    """Frequency / manager / missed filters + roaster-vs-visit table."""
+    # Frequency filter
+    freq = st.radio("Frequency", ["Last 7 Days", "Last 30 Days", "All Time"], key=f"{key_prefix}vs_freq")
+    today = datetime.date.today()
+    if freq == "Last 7 Days":
+        visit_df = visit_df[visit_df["Date"] >= today - datetime.timedelta(days=7)]
+        roaster_df = roaster_df[roaster_df["Date"] >= today - datetime.timedelta(days=7)]
+    elif freq == "Last 30 Days":
+        visit_df = visit_df[visit_df["Date"] >= today - datetime.timedelta(days=30)]
+        roaster_df = roaster_df[roaster_df["Date"] >= today - datetime.timedelta(days=30)]
+
+    # Rename columns for consistency
+    roaster_df = roaster_df.rename(columns={"Manager": "Manager Name", "Kitchen": "Scheduled Kitchen"})
+    visit_df = visit_df.rename(columns={"Kitchen Name": "Visited Kitchen"})
+
+    # Merge by Manager + Date + Kitchen
+    summary_df = pd.merge(
+        roaster_df,
+        visit_df[["Date", "Manager Name", "Visited Kitchen"]],
+        left_on=["Date", "Manager Name", "Scheduled Kitchen"],
+        right_on=["Date", "Manager Name", "Visited Kitchen"],
+        how="left"
+    )
+
+    # Add match indicator
+    summary_df["Visited?"] = summary_df["Visited Kitchen"].apply(lambda x: "Yes" if pd.notna(x) else "No")
+
+    # Drop duplicate "Visited Kitchen" column (optional, can keep it too)
+    summary_df = summary_df.drop(columns=["Visited Kitchen"])
+
+    # Sort and show
+    # Add Manager Name dropdown filter
+    summary_managers = ["All"] + sorted(summary_df["Manager Name"].dropna().unique())
+    selected_manager = st.selectbox("Select Kitchen Manager", summary_managers, key=f"{key_prefix}vs_manager")
+
+    # Toggle to show only missed visits
+    missed_only = st.checkbox("🔍 Show Missed Visits Only", key=f"{key_prefix}vs_missed")
+
+    # Apply filters
+    if selected_manager != "All":
+        summary_df = summary_df[summary_df["Manager Name"] == selected_manager]
+
+    if missed_only:
+        summary_df = summary_df[summary_df["Visited?"] == "No"]
+
+    # Sort and format date column
+    summary_df = summary_df.sort_values(["Date", "Manager Name"])
+    summary_df["Date"] = pd.to_datetime(summary_df["Date"], errors="coerce").dt.strftime("%Y-%m-%d")
+
+    # Function to highlight missed visits in red
+    def highlight_missed(row):
+        return ['background-color: #f8d7da' if row["Visited?"] == "No" else '' for _ in row]
+
+    # Apply styling
+    styled_df = summary_df.style.apply(highlight_missed, axis=1)
+
+    # Display styled dataframe
+    st.dataframe(styled_df, use_container_width=True)
+
+# -------------------- LIVE BOARD (incremental, auto-refreshing) --------------------
+# Only the dashboard panel reruns on each tick (st.fragment) and only rows appended
+# since the previous tick are fetched; the punch form and page setup stay untouched.
+LIVE_REFRESH_SECONDS = int(st.secrets.get("LIVE_REFRESH_SECONDS", 30))
+live_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+
+def parse_sheet_rows(rows, width):
+    """Pad rows to the header width and convert numbers the way get_all_records does."""
+    return [gspread.utils.numericise_all((list(r) + [""] * width)[:width], default_blank="") for r in rows]
+
+def sync_sheet_tail(ws, cache):
+    """
+    Re-read from the last cached row to the end of the sheet in one call. If that row
+    no longer matches (rows deleted or edited above it) return False so the caller
+    starts over; otherwise append the rows after it and return True.
+    """
+    header, rows = cache["header"], cache["rows"]
+    end_col = gspread.utils.rowcol_to_a1(1, len(header)).rstrip("0123456789")
+    first_row = len(rows) + 1 if rows else 2  # last cached row (+1 header, 1-based)
+    fetched = parse_sheet_rows(retry(ws.get, f"A{first_row}:{end_col}"), len(header))
+    if rows:
+        if not fetched or [str(v) for v in fetched[0]] != [str(v) for v in rows[-1]]:
+            return False
+        fetched = fetched[1:]
+    rows.extend(fetched)
+    return True
+
+def load_sheet_incremental(ws, state_key, snapshot=None):
+    """
+    Return the sheet as a DataFrame, keeping the rows in session_state and pulling
+    only the rows appended since the last call. A new session starts from the shared
+    `snapshot()` (attendance index) when given, instead of its own full download.
+    """
+    cache = st.session_state.get(state_key)
+    if cache is None and snapshot is not None:
+        index = snapshot()
+        if index["header"]:
+            header = list(index["header"])
+            cache = {"header": header, "rows": [[r.get(h, "") for h in header] for r in index["records"]]}
+    if cache is not None and cache["header"] and not sync_sheet_tail(ws, cache):
+        cache = None
+    if cache is None or not cache["header"]:
+        # First load, sheet still empty last time, or the tail no longer matches — fetch everything
+        values = retry(ws.get_all_values)
+        header = values[0] if values else []
+        cache = {"header": header, "rows": parse_sheet_rows(values[1:], len(header))}
+    st.session_state[state_key] = cache
+
+    header = cache["header"]
+    if not header:
+        return pd.DataFrame()
+    df = pd.DataFrame(cache["rows"], columns=header)
+    if not df.empty and "Date" in df.columns:
+        df["Date"] = pd.to_datetime(df["Date"], errors="coerce").dt.date
+    return df
+
+def reset_live_cache(*state_keys):
+    for key in state_keys:
+        st.session_state.pop(key, None)
+
+if live_fragment:
+    @live_fragment(run_every=LIVE_REFRESH_SECONDS)
+    def attendance_live_board():
+        try:
+            full_df = load_sheet_incremental(worksheet, "live_attendance", snapshot=load_attendance_index)
+        except Exception as e:
+            st.error(f"⚠️ Live refresh failed: {e}")
+            return
+        st.caption(f"🔴 Live · refreshes every {LIVE_REFRESH_SECONDS}s · "
+                   f"last update {datetime.datetime.now(pytz.timezone('Asia/Kolkata')).strftime('%H:%M:%S')}")
+        try:
+            live_roaster_df = load_roaster_df()
+        except Exception:
+            live_roaster_df = pd.DataFrame()
+        render_attendance(full_df, live_roaster_df, key_prefix="live_")
+
+    @live_fragment(run_every=LIVE_REFRESH_SECONDS)
+    def visit_summary_live_board():
+        try:
+            visit_df = load_sheet_incremental(worksheet, "live_attendance", snapshot=load_attendance_index)
+            live_roaster_df = load_sheet_incremental(roaster_sheet, "live_roaster")
+        except Exception as e:
+            st.error(f"⚠️ Live refresh failed: {e}")
+            return
+        if visit_df.empty or live_roaster_df.empty:
+            st.info("No visit or roaster data.")
+            return
+        st.caption(f"🔴 Live · refreshes every {LIVE_REFRESH_SECONDS}s · "
+                   f"last update {datetime.datetime.now(pytz.timezone('Asia/Kolkata')).strftime('%H:%M:%S')}")
+        render_visit_summary(visit_df, live_roaster_df, key_prefix="live_")
+
+def live_board_toggle(key):
+    """Checkbox + manual reload for the live board; returns True when live mode is on."""
+    if not live_fragment:
+        return False
+    live = st.checkbox("🔴 Live board (auto-refresh)", key=key)
+    if live and st.button("🔄 Full reload", key=f"{key}_reload"):
+        reset_live_cache("live_attendance", "live_roaster")
+    return live
+
 # -------------------- SUCCESS HELPERS --------------------
 def punch_success():
     st.success("✅ Attendance recorded. Thank you!")
@@ -300,6 +931,7 @@ def roaster_success():
 left_col, right_col = st.columns([2, 1])
 
 # ------- LEFT COLUMN: Punch In/Out -------
+profile_mark("punch")
 with left_col:
     st.subheader("Punch In / Punch Out")
 
@@ -324,23 +956,17 @@ with left_col:
         lon = st.session_state.get("user_lon") or "N/A"
         location_url = f"https://www.google.com/maps?q={lat},{lon}" if lat != "N/A" else "Location N/A"
 
-        # Prevent duplicate punches (same manager/kitchen/action same day)
+        # Prevent duplicate punches (same manager/kitchen/action same day) — live read of today's rows
         skip_duplicate_check = False
         try:
-            existing_records = safe_get_all_records(worksheet)
+            todays_keys = fresh_punch_keys(today_str)
         except Exception as e:
-            existing_records = []
+            todays_keys = set()
             skip_duplicate_check = True
             st.warning(f"⚠️ Unable to read attendance sheet for duplicate check: {e}")
 
         if not skip_duplicate_check:
-            if any(
-                    str(r.get("Date")) == today_str
-                    and r.get("Manager Name") == sel_manager
-                    and r.get("Kitchen Name") == sel_kitchen
-                    and r.get("Action") == sel_action
-                    for r in existing_records
-            ):
+            if punch_key(today_str, sel_manager, sel_kitchen, sel_action) in todays_keys:
                 st.warning("Duplicate punch today.")
                 st.stop()
 
@@ -358,9 +984,9 @@ with left_col:
             selfie_url = "UploadErr"
             st.warning(f"Selfie upload error: {e}")
 
-        # Append punch row
+        # Append punch row (re-checks for a duplicate under the punch lock)
         try:
-            safe_append_row(worksheet, [
+            recorded = record_punch([
                 today_str,
                 time_str,
                 sel_manager,
@@ -371,7 +997,10 @@ with left_col:
                 selfie_url,
                 location_url,
             ])
-            punch_success()
+            if recorded:
+                punch_success()
+            else:
+                st.warning("Duplicate punch today.")
         except Exception as e:
             st.error("❌ Error submitting attendance. Please try again.")
             st.exception(e)
@@ -386,7 +1015,8 @@ with right_col:
             "Visit Summary",
             "Roaster Entry",
             "Daily Review",
-            "Leave Request"
+            "Leave Request",
+            "Export Reports"
         ],
         format_func=lambda x: {
             "Roaster View": "📅 Roaster",
@@ -394,11 +1024,13 @@ with right_col:
             "Visit Summary": "📊 Visit Summary",
             "Roaster Entry": "📝 Roaster Entry",
             "Daily Review": "🧾 Daily Review",
-            "Leave Request": "🛌 Leave Request"
+            "Leave Request": "🛌 Leave Request",
+            "Export Reports": "📦 Export Reports"
         }.get(x, x),
     )
 
     st.write(f"🔍 Currently selected tab: {tab}")  # Debug line
+    profile_mark(f"tab:{tab}")
 
     if tab == "Roaster Entry":
         st.subheader("📆 Submit Weekly Roaster")
@@ -448,6 +1080,7 @@ with right_col:
             if submit_roaster and entries:
                 for row in entries:
                     safe_append_row(roaster_sheet, row)
+                invalidate_snapshot("roaster")
                 st.success("✅ Roaster submitted successfully")
 
     # ---- Roaster View ----
@@ -480,118 +1113,94 @@ with right_col:
 
     # ---- Attendance ----
     elif tab == "Attendance":
-        try:
-            records = safe_get_all_records(worksheet)
-            if not records:
-                st.warning("No data found in the sheet.")
-            else:
-                for r in records:
-                    # process rows
-                    pass
-            full_df = pd.DataFrame(records)
-            if not full_df.empty:
-                full_df["Date"] = pd.to_datetime(full_df["Date"], errors="coerce").dt.date
-        except Exception as e:
-            full_df = pd.DataFrame()
-            st.error("⚠️ Error loading attendance data. Please check your sheet structure or try again later.")
-            st.exception(e)
-
-        if full_df.empty:
-            st.info("No attendance data.")
+        if live_board_toggle("live_attendance_on"):
+            attendance_live_board()
         else:
-            sel_date = st.date_input("Date", value=datetime.date.today())
-            view_df = full_df[full_df["Date"] == sel_date]
-            if view_df.empty:
-                st.info("No attendance records for this date.")
-            else:
-                if not roaster_df.empty:
-                    roster_today = roaster_df[roaster_df["Date"] == sel_date][["Manager", "Kitchen"]]
-                    view_df["key"] = view_df["Manager Name"] + "|" + view_df["Kitchen Name"]
-                    roster_today["key"] = roster_today["Manager"] + "|" + roster_today["Kitchen"]
-                    view_df["Mismatch"] = ~view_df["key"].isin(roster_today["key"])
-                    view_df = view_df.drop(columns=["key"])
-                st.dataframe(view_df, use_container_width=True)
+            try:
+                records = load_attendance_index()["records"]
+                if not records:
+                    st.warning("No data found in the sheet.")
+                full_df = pd.DataFrame(records)
+                if not full_df.empty:
+                    full_df["Date"] = pd.to_datetime(full_df["Date"], errors="coerce").dt.date
+            except Exception as e:
+                full_df = pd.DataFrame()
+                st.error("⚠️ Error loading attendance data. Please check your sheet structure or try again later.")
+                st.exception(e)
+
+            render_attendance(full_df, roaster_df)
 
     # ---- Visit Summary ----
     elif tab == "Visit Summary":
         st.subheader("📊 Visit vs Roaster Summary")
 
-        try:
-            # Load Visit Records from Sheet1
-            visit_sheet = safe_open("Manager Visit Tracker").worksheet("Sheet1")
-            visit_records = safe_get_all_records(visit_sheet)
-            visit_df = pd.DataFrame(visit_records)
-
-            # Load Roaster Records from Roaster
-            roaster_sheet = safe_open("Manager Visit Tracker").worksheet("Roaster")
-            roaster_records = safe_get_all_records(roaster_sheet)
-            roaster_df = pd.DataFrame(roaster_records)
-
-            # Convert Date columns
-            visit_df["Date"] = pd.to_datetime(visit_df["Date"], errors="coerce").dt.date
-            roaster_df["Date"] = pd.to_datetime(roaster_df["Date"], errors="coerce").dt.date
-
-        except Exception as e:
-            st.error(f"Error loading sheets: {e}")
-            st.stop()
-
-        # Frequency filter
-        freq = st.radio("Frequency", ["Last 7 Days", "Last 30 Days", "All Time"])
-        today = datetime.date.today()
-        if freq == "Last 7 Days":
-            visit_df = visit_df[visit_df["Date"] >= today - datetime.timedelta(days=7)]
-            roaster_df = roaster_df[roaster_df["Date"] >= today - datetime.timedelta(days=7)]
-        elif freq == "Last 30 Days":
-            visit_df = visit_df[visit_df["Date"] >= today - datetime.timedelta(days=30)]
-            roaster_df = roaster_df[roaster_df["Date"] >= today - datetime.timedelta(days=30)]
-
-        # Rename columns for consistency
-        roaster_df.rename(columns={"Manager": "Manager Name", "Kitchen": "Scheduled Kitchen"}, inplace=True)
-        visit_df.rename(columns={"Kitchen Name": "Visited Kitchen"}, inplace=True)
-
-        # Merge by Manager + Date + Kitchen
-        summary_df = pd.merge(
-            roaster_df,
-            visit_df[["Date", "Manager Name", "Visited Kitchen"]],
-            left_on=["Date", "Manager Name", "Scheduled Kitchen"],
-            right_on=["Date", "Manager Name", "Visited Kitchen"],
-            how="left"
-        )
-
-        # Add match indicator
-        summary_df["Visited?"] = summary_df["Visited Kitchen"].apply(lambda x: "Yes" if pd.notna(x) else "No")
-
-        # Drop duplicate "Visited Kitchen" column (optional, can keep it too)
-        summary_df = summary_df.drop(columns=["Visited Kitchen"])
-
-        # Sort and show
-        # Add Manager Name dropdown filter
-        manager_list = ["All"] + sorted(summary_df["Manager Name"].dropna().unique())
-        selected_manager = st.selectbox("Select Kitchen Manager", manager_list)
-
-        # Toggle to show only missed visits
-        missed_only = st.checkbox("🔍 Show Missed Visits Only")
-
-        # Apply filters
-        if selected_manager != "All":
-            summary_df = summary_df[summary_df["Manager Name"] == selected_manager]
-
-        if missed_only:
-            summary_df = summary_df[summary_df["Visited?"] == "No"]
-
-        # Sort and format date column
-        summary_df = summary_df.sort_values(["Date", "Manager Name"])
-        summary_df["Date"] = pd.to_datetime(summary_df["Date"], errors="coerce").dt.strftime("%Y-%m-%d")
-
-        # Function to highlight missed visits in red
-        def highlight_missed(row):
-            return ['background-color: #f8d7da' if row["Visited?"] == "No" else '' for _ in row]
+        if live_board_toggle("live_summary_on"):
+            visit_summary_live_board()
+        else:
+            try:
+                # Load Visit Records from Sheet1
+                visit_sheet = safe_open("Manager Visit Tracker").worksheet("Sheet1")
+                visit_records = safe_get_all_records(visit_sheet)
+                visit_df = pd.DataFrame(visit_records)
+
+                # Load Roaster Records from Roaster
+                roaster_sheet = safe_open("Manager Visit Tracker").worksheet("Roaster")
+                roaster_records = safe_get_all_records(roaster_sheet)
+                roaster_df = pd.DataFrame(roaster_records)
+
+                # Convert Date columns
+                visit_df["Date"] = pd.to_datetime(visit_df["Date"], errors="coerce").dt.date
+                roaster_df["Date"] = pd.to_datetime(roaster_df["Date"], errors="coerce").dt.date
+
+            except Exception as e:
+                st.error(f"Error loading sheets: {e}")
+                st.stop()
 
-        # Apply styling
-        styled_df = summary_df.style.apply(highlight_missed, axis=1)
+            render_visit_summary(visit_df, roaster_df)
+
+    # ---- Export Reports ----
+    elif tab == "Export Reports":
+        st.subheader("📦 Export Reports")
+
+        with st.form("export_form"):
+            month_start = datetime.date.today().replace(day=1)
+            month_choices = []
+            for _ in range(12):
+                month_choices.append(month_start.strftime("%Y-%m"))
+                month_start = (month_start - datetime.timedelta(days=1)).replace(day=1)
+            first_month = st.selectbox("From Month", month_choices, index=0)
+            last_month = st.selectbox("To Month", month_choices, index=0)
+            export_by = st.radio("One file per", ["month", "manager"], horizontal=True)
+            export_reports_sel = st.multiselect("Reports", report_export.REPORTS, default=report_export.REPORTS)
+            export_fmt = st.selectbox("Format", report_export.FORMATS)
+            export_submit = st.form_submit_button("Build Export")
+
+        if export_submit and not export_reports_sel:
+            st.warning("⚠️ Please select at least one report.")
+        elif export_submit:
+            start, end = report_export.month_bounds(min(first_month, last_month), max(first_month, last_month))
+            try:
+                with tempfile.TemporaryDirectory() as out_dir, st.spinner("Building reports..."):
+                    paths = report_export.export_reports(client, start, end, out_dir, by=export_by,
+                                                         reports=export_reports_sel, fmt=export_fmt)
+                    zip_buf = io.BytesIO()
+                    with zipfile.ZipFile(zip_buf, "w", zipfile.ZIP_DEFLATED) as zf:
+                        for path in paths:
+                            zf.write(path, os.path.basename(path))
+            except Exception as e:
+                st.error(f"❌ Export failed: {e}")
+                st.stop()
 
-        # Display styled dataframe
-        st.dataframe(styled_df, use_container_width=True)
+            if not paths:
+                st.info("No data for the selected period.")
+            else:
+                st.success(f"✅ {len(paths)} file(s) built.")
+                st.download_button(
+                    "⬇️ Download ZIP",
+                    data=zip_buf.getvalue(),
+                    file_name=f"hybb_reports_{start:%Y%m}_{end:%Y%m}_{export_by}.zip",
+                    mime="application/zip",
+                )
 
     # ---- Daily Review ----
     elif tab == "Daily Review":
@@ -755,3 +1364,16 @@ HYBB Attendance System
                 )
 
                 st.success("✅ Leave request submitted and email sent to HR.")
+
+# -------------------- PROFILING SUMMARY --------------------
+if profiler:
+    summary = profiler.finish()
+    with st.expander(f"⏱️ Rerun profile — {summary['total_seconds']:.2f}s total"):
+        st.markdown("**Time by section (s)**")
+        st.dataframe(pd.DataFrame(list(summary["sections"].items()), columns=["Section", "Seconds"]), use_container_width=True)
+        st.markdown(f"**Top hot spots (self samples @ {summary['interval_ms']:.0f} ms)**")
+        st.dataframe(pd.DataFrame(summary["hot_spots"], columns=["Function", "Samples"]), use_container_width=True)
+        if summary["files"]:
+            st.caption("Written: " + ", ".join(summary["files"]))
+        else:
+            st.warning(f"Could not write profile files: {summary.get('write_error')}")
@@ -0,0 +1,251 @@
+# =============================
+# HYBB Attendance System – Bulk report export
+# -----------------------------
+# Builds per-month or per-manager report files from the "Manager Visit Tracker" sheets:
+# ▪ attendance  – punch rows (Sheet1)
+# ▪ adherence   – roaster vs visits (same merge as the Visit Summary tab)
+# ▪ review      – Daily Review submissions
+# ▪ leave       – Leave Requests overlapping the period
+#
+# Sheets are read in row chunks and filtered to the requested period as they stream
+# in, so memory is bounded by the period, not by the full sheet history. One file per
+# (report, month|manager) is built on a thread pool.
+#
+# Used by the "Export Reports" tab in app.py and from the command line:
+#   python report_export.py --from 2025-07 --to 2025-07 --by manager --format xlsx --out exports
+# Credentials: --creds service_account.json or the GOOGLE_SHEETS_CREDS env var (JSON string).
+# =============================
+
+import argparse
+import concurrent.futures
+import datetime
+import json
+import os
+import re
+import time
+
+import gspread
+import pandas as pd
+
+SPREADSHEET_NAME = "Manager Visit Tracker"
+CHUNK_ROWS = 2000
+
+# report -> (worksheet, date column(s), manager column)
+SOURCES = {
+    "attendance": ("Sheet1", ("Date",), "Manager Name"),
+    "roaster": ("Roaster", ("Date",), "Manager"),
+    "review": ("Daily Review", ("Date",), "Manager"),
+    "leave": ("Leave Requests", ("From Date", "To Date"), "Manager"),
+}
+REPORTS = ["attendance", "adherence", "review", "leave"]
+FORMATS = ["csv", "xlsx", "parquet"]
+
+
+def month_bounds(first_month, last_month):
+    """('2025-06', '2025-07') -> (date(2025, 6, 1), date(2025, 7, 31))."""
+    start = datetime.datetime.strptime(first_month, "%Y-%m").date()
+    last = datetime.datetime.strptime(last_month, "%Y-%m").date()
+    end = (last.replace(day=28) + datetime.timedelta(days=4)).replace(day=1) - datetime.timedelta(days=1)
+    return start, end
+
+
+def with_retry(func, *args, retries=4, delay=2, backoff=2, **kwargs):
+    """Retry Sheets API calls on API errors (429 quota / 5xx) and connection errors, with backoff."""
+    for attempt in range(retries):
+        try:
+            return func(*args, **kwargs)
+        except (gspread.exceptions.APIError, OSError):
+            if attempt == retries - 1:
+                raise
+            time.sleep(delay * backoff ** attempt)
+
+
+def iter_sheet_chunks(ws, chunk_rows=CHUNK_ROWS):
+    """
+    Yield the worksheet as DataFrames of at most `chunk_rows` rows (header from row 1).
+    Walks the whole grid (ws.row_count): the API trims trailing blank rows from each
+    range, so a short or empty chunk does not mean the data has ended. Values are
+    numericised like get_all_records; blank cells become None.
+    """
+    header = with_retry(ws.row_values, 1)
+    if not header:
+        return
+    end_col = gspread.utils.rowcol_to_a1(1, len(header)).rstrip("0123456789")
+    for start in range(2, ws.row_count + 1, chunk_rows):
+        rows = with_retry(ws.get, f"A{start}:{end_col}{start + chunk_rows - 1}")
+        if not rows:
+            continue
+        rows = [gspread.utils.numericise_all((list(r) + [""] * len(header))[:len(header)], default_blank=None)
+                for r in rows]
+        yield pd.DataFrame(rows, columns=header)
+
+
+def load_period(ws, date_cols, start, end, chunk_rows=CHUNK_ROWS):
+    """Stream a worksheet and keep only rows whose date (or date range) touches [start, end]."""
+    kept = []
+    for chunk in iter_sheet_chunks(ws, chunk_rows):
+        if any(col not in chunk.columns for col in date_cols):
+            continue
+        for col in date_cols:
+            chunk[col] = pd.to_datetime(chunk[col], errors="coerce").dt.date
+        first, last = chunk[date_cols[0]], chunk[date_cols[-1]]
+        chunk = chunk[(first <= end) & (last >= start)]
+        if not chunk.empty:
+            kept.append(chunk)
+    return pd.concat(kept, ignore_index=True) if kept else pd.DataFrame()
+
+
+def adherence_frame(roaster_df, visit_df):
+    """Roaster rows with a Visited? Yes/No flag (matches the Visit Summary tab)."""
+    if roaster_df.empty:
+        return pd.DataFrame()
+    roaster_df = roaster_df.rename(columns={"Manager": "Manager Name", "Kitchen": "Scheduled Kitchen"})
+    if visit_df.empty:
+        visit_df = pd.DataFrame(columns=["Date", "Manager Name", "Visited Kitchen"])
+    else:
+        visit_df = visit_df.rename(columns={"Kitchen Name": "Visited Kitchen"})
+    visits = visit_df[["Date", "Manager Name", "Visited Kitchen"]].drop_duplicates()
+    summary_df = pd.merge(
+        roaster_df,
+        visits,
+        left_on=["Date", "Manager Name", "Scheduled Kitchen"],
+        right_on=["Date", "Manager Name", "Visited Kitchen"],
+        how="left"
+    )
+    summary_df["Visited?"] = summary_df["Visited Kitchen"].notna().map({True: "Yes", False: "No"})
+    return summary_df.drop(columns=["Visited Kitchen"]).sort_values(["Date", "Manager Name"])
+
+
+def months_between(first, last):
+    """Every 'YYYY-MM' from first's month to last's month."""
+    months, month = [], first.replace(day=1)
+    while month <= last:
+        months.append(month.strftime("%Y-%m"))
+        month = (month + datetime.timedelta(days=32)).replace(day=1)
+    return months
+
+
+def iter_groups(df, date_cols, manager_col, by, start, end):
+    """
+    Yield (key, rows) per manager or per month. A row with a date range (leave) is
+    copied into every month it overlaps within [start, end]; only the month keys are
+    limited to the period, the row's own From/To dates are written unchanged.
+    """
+    if by == "manager":
+        yield from df.groupby(df[manager_col].astype(str), sort=True)
+        return
+    first_col, last_col = date_cols[0], date_cols[-1]
+    months = df.apply(
+        lambda r: months_between(max(r[first_col], start), min(r[last_col], end))
+        if pd.notna(r[first_col]) and pd.notna(r[last_col]) else [],
+        axis=1,
+    )
+    exploded = df.assign(_month=months).explode("_month").dropna(subset=["_month"])
+    for key, group in exploded.groupby("_month", sort=True):
+        yield key, group.drop(columns=["_month"])
+
+
+def parquet_ready(df):
+    """Keep typed columns; only object columns mixing types become strings (nulls stay null)."""
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype == object and pd.api.types.infer_dtype(df[col], skipna=True).startswith("mixed"):
+            df[col] = df[col].map(lambda v: None if pd.isna(v) else str(v))
+    return df
+
+
+def write_report(df, path, fmt):
+    if fmt == "csv":
+        df.to_csv(path, index=False)
+    elif fmt == "xlsx":
+        df.to_excel(path, index=False)  # needs openpyxl
+    elif fmt == "parquet":
+        parquet_ready(df).to_parquet(path, index=False)  # needs pyarrow
+    else:
+        raise ValueError(f"Unknown format: {fmt}")
+    return path
+
+
+def safe_filename(text):
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", text).strip("_") or "unknown"
+
+
+def export_reports(client, start, end, out_dir, by="month", reports=None, fmt="csv",
+                   workers=4, spreadsheet_name=SPREADSHEET_NAME, chunk_rows=CHUNK_ROWS):
+    """
+    Build one file per (report, month|manager) for the period [start, end].
+    Returns the list of written file paths.
+    """
+    reports = REPORTS if reports is None else reports
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt}")
+    os.makedirs(out_dir, exist_ok=True)
+    sh = with_retry(client.open, spreadsheet_name)
+
+    needed = set()
+    for report in reports:
+        needed.update(["attendance", "roaster"] if report == "adherence" else [report])
+
+    def load(source):
+        ws_name, date_cols, _ = SOURCES[source]
+        try:
+            ws = with_retry(sh.worksheet, ws_name)
+        except gspread.exceptions.WorksheetNotFound:
+            return pd.DataFrame()
+        return load_period(ws, date_cols, start, end, chunk_rows)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        # Stage 1: stream each source sheet (in parallel), keeping only the period
+        frames = dict(zip(needed, pool.map(load, needed)))
+
+        # Stage 2: one task per (report, group)
+        tasks = []
+        for report in reports:
+            if report == "adherence":
+                df = adherence_frame(frames["roaster"], frames["attendance"])
+                date_cols, manager_col = ("Date",), "Manager Name"
+            else:
+                df = frames[report]
+                _, date_cols, manager_col = SOURCES[report]
+            if df.empty:
+                continue
+            for key, group in iter_groups(df, date_cols, manager_col, by, start, end):
+                path = os.path.join(out_dir, f"{report}_{safe_filename(str(key))}.{fmt}")
+                tasks.append(pool.submit(write_report, group, path, fmt))
+        return [t.result() for t in tasks]
+
+
+def authorize_from_env(creds_path=None):
+    from google.oauth2.service_account import Credentials
+    scopes = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
+    if creds_path:
+        creds = Credentials.from_service_account_file(creds_path, scopes=scopes)
+    else:
+        creds = Credentials.from_service_account_info(json.loads(os.environ["GOOGLE_SHEETS_CREDS"]), scopes=scopes)
+    return gspread.authorize(creds)
+
+
+def main(argv=None):
+    this_month = datetime.date.today().strftime("%Y-%m")
+    parser = argparse.ArgumentParser(description="Export HYBB attendance / adherence / review / leave reports.")
+    parser.add_argument("--from", dest="first_month", default=this_month, help="first month, YYYY-MM")
+    parser.add_argument("--to", dest="last_month", default=None, help="last month, YYYY-MM (default: --from)")
+    parser.add_argument("--by", choices=["month", "manager"], default="month")
+    parser.add_argument("--reports", nargs="+", choices=REPORTS, default=REPORTS)
+    parser.add_argument("--format", choices=FORMATS, default="csv")
+    parser.add_argument("--out", default="exports")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--creds", default=None, help="service-account JSON file (else GOOGLE_SHEETS_CREDS env)")
+    args = parser.parse_args(argv)
+
+    start, end = month_bounds(args.first_month, args.last_month or args.first_month)
+    client = authorize_from_env(args.creds)
+    paths = export_reports(client, start, end, args.out, by=args.by, reports=args.reports,
+                           fmt=args.format, workers=args.workers)
+    for path in paths:
+        print(path)
+    print(f"{len(paths)} file(s) written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import datetime
+
+import pandas as pd
+
+import report_export as rx
+
+D = datetime.date
+
+
+def test_month_bounds():
+    assert rx.month_bounds("2025-06", "2025-07") == (D(2025, 6, 1), D(2025, 7, 31))
+    assert rx.month_bounds("2024-02", "2024-02") == (D(2024, 2, 1), D(2024, 2, 29))
+    assert rx.month_bounds("2025-12", "2025-12") == (D(2025, 12, 1), D(2025, 12, 31))
+
+
+def test_months_between():
+    assert rx.months_between(D(2025, 1, 31), D(2025, 3, 1)) == ["2025-01", "2025-02", "2025-03"]
+    assert rx.months_between(D(2025, 12, 15), D(2026, 1, 2)) == ["2025-12", "2026-01"]
+    assert rx.months_between(D(2025, 6, 10), D(2025, 6, 12)) == ["2025-06"]
+
+
+def leave_frame():
+    return pd.DataFrame({
+        "Manager": ["A", "B", "C"],
+        "From Date": [D(2025, 5, 28), D(2025, 6, 29), D(2025, 6, 10)],
+        "To Date": [D(2025, 6, 3), D(2025, 8, 2), D(2025, 6, 12)],
+    })
+
+
+def test_iter_groups_by_month_explodes_and_clips_to_period():
+    start, end = rx.month_bounds("2025-06", "2025-07")
+    groups = dict(rx.iter_groups(leave_frame(), ("From Date", "To Date"), "Manager", "month", start, end))
+    # May and August are outside the period, so no files for them
+    assert sorted(groups) == ["2025-06", "2025-07"]
+    assert list(groups["2025-06"]["Manager"]) == ["A", "B", "C"]
+    assert list(groups["2025-07"]["Manager"]) == ["B"]
+    # Row dates are written unchanged
+    assert groups["2025-07"]["From Date"].iloc[0] == D(2025, 6, 29)
+    assert "_month" not in groups["2025-06"].columns
+
+
+def test_iter_groups_by_month_single_date_and_missing_dates():
+    df = pd.DataFrame({"Manager Name": ["A", "B", "C"], "Date": [D(2025, 6, 30), D(2025, 7, 1), None]})
+    start, end = rx.month_bounds("2025-06", "2025-07")
+    groups = dict(rx.iter_groups(df, ("Date",), "Manager Name", "month", start, end))
+    assert {k: list(g["Manager Name"]) for k, g in groups.items()} == {"2025-06": ["A"], "2025-07": ["B"]}
+
+
+def test_iter_groups_by_manager():
+    start, end = rx.month_bounds("2025-06", "2025-07")
+    groups = dict(rx.iter_groups(leave_frame(), ("From Date", "To Date"), "Manager", "manager", start, end))
+    assert sorted(groups) == ["A", "B", "C"]
+    assert all(len(g) == 1 for g in groups.values())